@@ -6,15 +6,20 @@ Fetches free agricultural APIs and serves clean data for crop recommendations
 
 import requests
 import json
+import orjson
 import sqlite3
 from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Tuple
 import logging
 import asyncio
+import threading
+import functools
+import numpy as np
 import aiohttp
 import uvicorn
 import time
@@ -60,18 +65,153 @@ class AgricultureResponse(BaseModel):
     soil: SoilData
     crop_recommendations: List[CropRecommendation]
 
+# Region bounding boxes as (lat_min, lat_max, lon_min, lon_max) rows;
+# row order preserves the precedence of the original if/elif chain
+_REGION_BOUNDS = np.array([
+    [30.0, 33.0, 70.0, 75.0],  # punjab
+    [24.0, 28.0, 66.0, 71.0],  # sindh
+    [33.0, 37.0, 69.0, 74.0],  # kpk
+    [24.0, 32.0, 60.0, 70.0],  # balochistan
+])
+_REGION_NAMES = ("punjab", "sindh", "kpk", "balochistan")
+_REGION_DISPLAY = {
+    "punjab": "Punjab",
+    "sindh": "Sindh",
+    "kpk": "Khyber Pakhtunkhwa",
+    "balochistan": "Balochistan",
+}
+
+# Pakistan soil data approximation by region, validated once at import
+_SOIL_BY_REGION = {
+    # Punjab (fertile alluvial soil)
+    'punjab': SoilData(
+        ph=7.2, organic_matter=1.8, nitrogen=0.05,
+        phosphorus=12.5, potassium=180, soil_type='Alluvial'
+    ),
+    # Sindh (riverine and desert soil)
+    'sindh': SoilData(
+        ph=7.8, organic_matter=1.2, nitrogen=0.03,
+        phosphorus=8.5, potassium=120, soil_type='Riverine'
+    ),
+    # KPK (mountainous soil)
+    'kpk': SoilData(
+        ph=6.8, organic_matter=2.1, nitrogen=0.06,
+        phosphorus=15.0, potassium=200, soil_type='Mountain'
+    ),
+    # Balochistan (arid soil)
+    'balochistan': SoilData(
+        ph=8.1, organic_matter=0.8, nitrogen=0.02,
+        phosphorus=6.0, potassium=90, soil_type='Arid'
+    )
+}
+
+
+def classify_region(lat: float, lon: float) -> Optional[str]:
+    """Classify coordinates into a Pakistan region key, or None if outside all boxes"""
+    mask = ((_REGION_BOUNDS[:, 0] <= lat) & (lat <= _REGION_BOUNDS[:, 1])
+            & (_REGION_BOUNDS[:, 2] <= lon) & (lon <= _REGION_BOUNDS[:, 3]))
+    if not mask.any():
+        return None
+    return _REGION_NAMES[mask.argmax()]
+
+
+@functools.lru_cache(maxsize=4096)
+def _temp_score(temp_tenths: int, min_tenths: int, max_tenths: int) -> float:
+    """Temperature suitability on tenth-of-a-degree integers so results memoize"""
+    if min_tenths <= temp_tenths <= max_tenths:
+        return 10.0
+    if temp_tenths < min_tenths:
+        diff = (min_tenths - temp_tenths) / 10
+    else:
+        diff = (temp_tenths - max_tenths) / 10
+    return max(0, 10 - (diff * 0.5))
+
+
+@functools.lru_cache(maxsize=4096)
+def _ph_score(ph_hundredths: int, min_hundredths: int, max_hundredths: int) -> float:
+    """pH suitability on hundredth-of-a-unit integers so results memoize"""
+    if min_hundredths <= ph_hundredths <= max_hundredths:
+        return 10.0
+    if ph_hundredths < min_hundredths:
+        diff = (min_hundredths - ph_hundredths) / 100
+    else:
+        diff = (ph_hundredths - max_hundredths) / 100
+    return max(0, 10 - (diff * 2))
+
+
+# Pakistan major crops with their requirements
+_CROPS_DATA = {
+    'wheat': {
+        'temp_range': (15, 25),
+        'ph_range': (6.0, 7.5),
+        'season': 'Rabi',
+        'months': ['November', 'December'],
+        'water_need': 450,  # mm
+        'npk': '120-60-60'
+    },
+    'rice': {
+        'temp_range': (20, 35),
+        'ph_range': (5.5, 7.0),
+        'season': 'Kharif',
+        'months': ['May', 'June', 'July'],
+        'water_need': 1200,
+        'npk': '120-90-60'
+    },
+    'cotton': {
+        'temp_range': (21, 30),
+        'ph_range': (5.8, 8.0),
+        'season': 'Kharif',
+        'months': ['April', 'May'],
+        'water_need': 800,
+        'npk': '150-75-75'
+    },
+    'sugarcane': {
+        'temp_range': (20, 35),
+        'ph_range': (6.0, 7.5),
+        'season': 'Kharif',
+        'months': ['February', 'March', 'April'],
+        'water_need': 1500,
+        'npk': '200-100-100'
+    },
+    'maize': {
+        'temp_range': (15, 30),
+        'ph_range': (6.0, 7.0),
+        'season': 'Kharif',
+        'months': ['June', 'July'],
+        'water_need': 600,
+        'npk': '120-80-60'
+    }
+}
+
+# Structure-of-arrays layout so suitability scoring is one vectorized
+# expression instead of per-crop Python calls
+_CROP_NAMES = tuple(_CROPS_DATA)
+_TEMP_MIN = np.array([c['temp_range'][0] for c in _CROPS_DATA.values()], dtype=np.float64)
+_TEMP_MAX = np.array([c['temp_range'][1] for c in _CROPS_DATA.values()], dtype=np.float64)
+_PH_MIN = np.array([c['ph_range'][0] for c in _CROPS_DATA.values()], dtype=np.float64)
+_PH_MAX = np.array([c['ph_range'][1] for c in _CROPS_DATA.values()], dtype=np.float64)
+
+
 class DataCollector:
     """Collects data from various free APIs"""
     
     def __init__(self):
         self.db_path = 'agriculture_data.db'
+        self.session: Optional[aiohttp.ClientSession] = None  # created on app startup
+        # One long-lived connection in autocommit mode; writes are serialized
+        # through _lock so the connection can be shared across worker threads
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        # Open-Meteo current weather barely changes within ~0.1°, so fetches
+        # are cached on coarse-rounded coordinates like the endpoint caches
+        self._fetch_cache = {}  # (round(lat,1), round(lon,1)): {"data": ..., "timestamp": ...}
+        self.apply_pragmas(self._conn.cursor())
         self.init_database()
-    
+
     def init_database(self):
         """Initialize SQLite database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        cursor = self._conn.cursor()
+
         # Weather data table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS weather_data (
@@ -118,11 +258,25 @@ class DataCollector:
             )
         ''')
         
-        conn.commit()
-        conn.close()
-    
-    async def fetch_weather_data(self, lat: float, lon: float) -> Optional[WeatherData]:
+        self._conn.commit()
+
+    def apply_pragmas(self, cursor):
+        """Tune SQLite for the write-heavy weather path: WAL allows concurrent
+        reads during writes and synchronous=NORMAL halves the fsyncs per commit"""
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")  # wait for the WAL writer slot instead of failing
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+
+    async def fetch_weather_data(self, lat: float, lon: float, save: bool = True) -> Optional[WeatherData]:
         """Fetch weather data from Open-Meteo (free API)"""
+        cache_key = (round(lat, 1), round(lon, 1))
+        cached = self._fetch_cache.get(cache_key)
+        if cached and time.time() - cached["timestamp"] < CACHE_DURATION:
+            return cached["data"]
+
         try:
             url = f"https://api.open-meteo.com/v1/forecast"
             params = {
@@ -132,30 +286,47 @@ class DataCollector:
                 'timezone': 'Asia/Karachi'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        current = data['current']
-                        
-                        weather = WeatherData(
-                            temperature=current.get('temperature_2m', 0),
-                            humidity=current.get('relative_humidity_2m', 0),
-                            rainfall=current.get('rain', 0),
-                            wind_speed=current.get('wind_speed_10m', 0),
-                            date=current.get('time', '')
-                        )
-                        
-                        # Save to database
-                        self.save_weather_data(lat, lon, weather)
-                        return weather
+            async with self.session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    current = data['current']
                         
+                    weather = WeatherData(
+                        temperature=current.get('temperature_2m', 0),
+                        humidity=current.get('relative_humidity_2m', 0),
+                        rainfall=current.get('rain', 0),
+                        wind_speed=current.get('wind_speed_10m', 0),
+                        date=current.get('time', '')
+                    )
+
+                    self._fetch_cache[cache_key] = {"data": weather, "timestamp": time.time()}
+
+                    # Save to database off the event loop (callers doing bulk
+                    # fetches pass save=False and flush one batch at the end)
+                    if save:
+                        await asyncio.to_thread(self.save_weather_data, [(lat, lon, weather)])
+                    return weather
+
+
         except Exception as e:
             logger.error(f"Error fetching weather data: {e}")
             return None
     
+    @staticmethod
+    def _power_series(values: Dict) -> np.ndarray:
+        """Date-ordered NASA POWER values as a float array, with the -999
+        missing-data sentinel mapped to NaN"""
+        keys = sorted(values)
+        arr = np.fromiter(
+            (values[k] if values[k] is not None else np.nan for k in keys),
+            dtype=np.float64, count=len(keys)
+        )
+        arr[arr <= -999] = np.nan
+        return arr
+
     async def fetch_nasa_power_data(self, lat: float, lon: float) -> Dict:
-        """Fetch solar and climate data from NASA POWER API (free)"""
+        """Fetch solar and climate data from NASA POWER API (free),
+        returning the raw parameters plus per-parameter aggregates"""
         try:
             url = "https://power.larc.nasa.gov/api/temporal/daily/point"
             params = {
@@ -168,159 +339,127 @@ class DataCollector:
                 'format': 'JSON'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('properties', {}).get('parameter', {})
-                        
+            async with self.session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    parameters = data.get('properties', {}).get('parameter', {})
+
+                    # Vectorized summaries instead of per-value Python loops
+                    aggregates = {}
+                    for name, values in parameters.items():
+                        series = self._power_series(values)
+                        valid = series.size - int(np.isnan(series).sum())
+                        aggregates[name] = {
+                            'mean': float(np.nanmean(series)) if valid else None,
+                            'total': float(np.nansum(series)) if valid else None,
+                        }
+
+                    return {'parameter': parameters, 'aggregates': aggregates}
+
+
         except Exception as e:
             logger.error(f"Error fetching NASA POWER data: {e}")
             return {}
     
     def get_soil_data(self, lat: float, lon: float) -> SoilData:
         """Get soil data based on Pakistan regions"""
-        # Pakistan soil data approximation by region
-        soil_data = {
-            # Punjab (fertile alluvial soil)
-            'punjab': SoilData(
-                ph=7.2, organic_matter=1.8, nitrogen=0.05, 
-                phosphorus=12.5, potassium=180, soil_type='Alluvial'
-            ),
-            # Sindh (riverine and desert soil)
-            'sindh': SoilData(
-                ph=7.8, organic_matter=1.2, nitrogen=0.03, 
-                phosphorus=8.5, potassium=120, soil_type='Riverine'
-            ),
-            # KPK (mountainous soil)
-            'kpk': SoilData(
-                ph=6.8, organic_matter=2.1, nitrogen=0.06, 
-                phosphorus=15.0, potassium=200, soil_type='Mountain'
-            ),
-            # Balochistan (arid soil)
-            'balochistan': SoilData(
-                ph=8.1, organic_matter=0.8, nitrogen=0.02, 
-                phosphorus=6.0, potassium=90, soil_type='Arid'
-            )
-        }
-        
-        # Determine region based on coordinates
-        if 30.0 <= lat <= 33.0 and 70.0 <= lon <= 75.0:
-            return soil_data['punjab']
-        elif 24.0 <= lat <= 28.0 and 66.0 <= lon <= 71.0:
-            return soil_data['sindh']
-        elif 33.0 <= lat <= 37.0 and 69.0 <= lon <= 74.0:
-            return soil_data['kpk']
-        elif 24.0 <= lat <= 32.0 and 60.0 <= lon <= 70.0:
-            return soil_data['balochistan']
-        else:
-            return soil_data['punjab']  # default
+        # Classification is bucketed to 4 regions, so coarse-rounded
+        # coordinates memoize perfectly
+        return self._soil_data_cached(round(lat, 1), round(lon, 1))
+
+    @functools.lru_cache(maxsize=4096)
+    def _soil_data_cached(self, lat: float, lon: float) -> SoilData:
+        # Determine region based on coordinates (punjab is the default)
+        return _SOIL_BY_REGION[classify_region(lat, lon) or 'punjab']
     
     def get_crop_recommendations(self, lat: float, lon: float, weather: WeatherData, soil: SoilData) -> List[CropRecommendation]:
         """Generate crop recommendations based on location, weather, and soil"""
+        # Score all crops at once: distance outside the optimal range costs
+        # 0.5 points/degree for temperature and 2 points/pH-unit, floored at 0
+        temp_score = np.maximum(
+            0, 10 - np.maximum(0, np.maximum(_TEMP_MIN - weather.temperature, weather.temperature - _TEMP_MAX)) * 0.5
+        )
+        ph_score = np.maximum(
+            0, 10 - np.maximum(0, np.maximum(_PH_MIN - soil.ph, soil.ph - _PH_MAX)) * 2
+        )
+
+        # Overall suitability (0-10 scale); sorting uses the rounded score
+        # with a stable sort so ties break on crop-table order, exactly as
+        # the original rounded-then-sorted list did. Python's round (not
+        # np.round, which differs on some floats) keeps the scores
+        # bit-identical to the original per-crop rounding
+        suitability = (temp_score + ph_score) / 2
+        rounded = np.fromiter(
+            (round(float(s), 1) for s in suitability), dtype=np.float64, count=len(suitability)
+        )
+
         recommendations = []
-        
-        # Pakistan major crops with their requirements
-        crops_data = {
-            'wheat': {
-                'temp_range': (15, 25),
-                'ph_range': (6.0, 7.5),
-                'season': 'Rabi',
-                'months': ['November', 'December'],
-                'water_need': 450,  # mm
-                'npk': '120-60-60'
-            },
-            'rice': {
-                'temp_range': (20, 35),
-                'ph_range': (5.5, 7.0),
-                'season': 'Kharif',
-                'months': ['May', 'June', 'July'],
-                'water_need': 1200,
-                'npk': '120-90-60'
-            },
-            'cotton': {
-                'temp_range': (21, 30),
-                'ph_range': (5.8, 8.0),
-                'season': 'Kharif',
-                'months': ['April', 'May'],
-                'water_need': 800,
-                'npk': '150-75-75'
-            },
-            'sugarcane': {
-                'temp_range': (20, 35),
-                'ph_range': (6.0, 7.5),
-                'season': 'Kharif',
-                'months': ['February', 'March', 'April'],
-                'water_need': 1500,
-                'npk': '200-100-100'
-            },
-            'maize': {
-                'temp_range': (15, 30),
-                'ph_range': (6.0, 7.0),
-                'season': 'Kharif',
-                'months': ['June', 'July'],
-                'water_need': 600,
-                'npk': '120-80-60'
-            }
-        }
-        
-        for crop_name, crop_data in crops_data.items():
-            # Calculate suitability score based on temperature and pH
-            temp_score = self.calculate_temperature_score(weather.temperature, crop_data['temp_range'])
-            ph_score = self.calculate_ph_score(soil.ph, crop_data['ph_range'])
-            
-            # Overall suitability (0-10 scale)
-            suitability = (temp_score + ph_score) / 2
-            
-            if suitability >= 5.0:  # Only recommend if reasonably suitable
-                recommendations.append(CropRecommendation(
-                    crop_name=crop_name.title(),
-                    suitability_score=round(suitability, 1),
-                    irrigation_need=crop_data['water_need'],
-                    fertilizer_npk=crop_data['npk'],
-                    season=crop_data['season'],
-                    planting_months=crop_data['months']
-                ))
-        
-        # Sort by suitability score
-        recommendations.sort(key=lambda x: x.suitability_score, reverse=True)
-        return recommendations[:3]  # Top 3 recommendations
+        for idx in np.argsort(-rounded, kind="stable"):
+            if suitability[idx] < 5.0:  # Only recommend if reasonably suitable
+                continue
+            crop_name = _CROP_NAMES[idx]
+            crop_data = _CROPS_DATA[crop_name]
+            recommendations.append(CropRecommendation(
+                crop_name=crop_name.title(),
+                suitability_score=float(rounded[idx]),
+                irrigation_need=crop_data['water_need'],
+                fertilizer_npk=crop_data['npk'],
+                season=crop_data['season'],
+                planting_months=crop_data['months']
+            ))
+            if len(recommendations) == 3:  # Top 3 recommendations
+                break
+
+        return recommendations
     
     def calculate_temperature_score(self, current_temp: float, optimal_range: tuple) -> float:
         """Calculate temperature suitability score (0-10)"""
         min_temp, max_temp = optimal_range
-        if min_temp <= current_temp <= max_temp:
-            return 10.0
-        elif current_temp < min_temp:
-            diff = min_temp - current_temp
-            return max(0, 10 - (diff * 0.5))
-        else:  # current_temp > max_temp
-            diff = current_temp - max_temp
-            return max(0, 10 - (diff * 0.5))
-    
+        return _temp_score(round(current_temp * 10), round(min_temp * 10), round(max_temp * 10))
+
     def calculate_ph_score(self, current_ph: float, optimal_range: tuple) -> float:
         """Calculate pH suitability score (0-10)"""
         min_ph, max_ph = optimal_range
-        if min_ph <= current_ph <= max_ph:
-            return 10.0
-        elif current_ph < min_ph:
-            diff = min_ph - current_ph
-            return max(0, 10 - (diff * 2))
-        else:  # current_ph > max_ph
-            diff = current_ph - max_ph
-            return max(0, 10 - (diff * 2))
+        return _ph_score(round(current_ph * 100), round(min_ph * 100), round(max_ph * 100))
     
-    def save_weather_data(self, lat: float, lon: float, weather: WeatherData):
-        """Save weather data to database"""
+    async def analyze_location(self, lat: float, lon: float) -> Optional[Tuple[Dict, Tuple[float, float, WeatherData]]]:
+        """Run the full weather/soil/crop analysis for one location.
+
+        Returns the result dict plus the weather row for deferred saving,
+        or None if weather could not be fetched."""
+        weather = await self.fetch_weather_data(lat, lon, save=False)
+        if not weather:
+            return None
+
+        soil = self.get_soil_data(lat, lon)
+        recommendations = self.get_crop_recommendations(lat, lon, weather, soil)
+
+        result = {
+            "location": {"latitude": lat, "longitude": lon},
+            "weather": weather,
+            "soil": soil,
+            "crop_recommendations": recommendations
+        }
+        return result, (lat, lon, weather)
+
+    def save_weather_data(self, rows: List[Tuple[float, float, WeatherData]]):
+        """Save weather rows to database in a single transaction"""
+        if not rows:
+            return
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO weather_data (latitude, longitude, temperature, humidity, rainfall, wind_speed, date)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (lat, lon, weather.temperature, weather.humidity, weather.rainfall, weather.wind_speed, weather.date))
-            conn.commit()
-            conn.close()
+            params = [
+                (lat, lon, w.temperature, w.humidity, w.rainfall, w.wind_speed, w.date)
+                for lat, lon, w in rows
+            ]
+            # The connection context manager commits on success and rolls
+            # back on error, so a failed batch can't wedge the shared
+            # connection inside an open transaction
+            with self._lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany('''
+                    INSERT INTO weather_data (latitude, longitude, temperature, humidity, rainfall, wind_speed, date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', params)
         except Exception as e:
             logger.error(f"Error saving weather data: {e}")
 
@@ -332,7 +471,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
-app = FastAPI(title="Pakistan Agriculture API", version="1.0.0")
+app = FastAPI(title="Pakistan Agriculture API", version="1.0.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -342,6 +481,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (analysis/batch responses); small payloads
+# skip compression via minimum_size
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+@app.on_event("startup")
+async def startup_event():
+    """Create one shared HTTP session so connections are pooled across requests"""
+    data_collector.session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if data_collector.session:
+        await data_collector.session.close()
+
 @app.get("/")
 async def root():
     return {"message": "Pakistan Agriculture Data API", "version": "1.0.0"}
@@ -443,15 +599,7 @@ async def get_complete_analysis(lat: float, lon: float):
         recommendations = data_collector.get_crop_recommendations(lat, lon, weather, soil)
 
         # Region logic
-        region = "Unknown"
-        if 30.0 <= lat <= 33.0 and 70.0 <= lon <= 75.0:
-            region = "Punjab"
-        elif 24.0 <= lat <= 28.0 and 66.0 <= lon <= 71.0:
-            region = "Sindh"
-        elif 33.0 <= lat <= 37.0 and 69.0 <= lon <= 74.0:
-            region = "Khyber Pakhtunkhwa"
-        elif 24.0 <= lat <= 32.0 and 60.0 <= lon <= 70.0:
-            region = "Balochistan"
+        region = _REGION_DISPLAY.get(classify_region(lat, lon), "Unknown")
 
         result = AgricultureResponse(
             location={
@@ -480,27 +628,30 @@ async def batch_analysis(locations: List[LocationRequest]):
     if len(locations) > 10:
         raise HTTPException(status_code=400, detail="Maximum 10 locations per request")
     
+    valid_locations = [
+        loc for loc in locations
+        if 23.0 <= loc.latitude <= 37.0 and 60.0 <= loc.longitude <= 77.0
+    ]
+
+    # Fetch all locations concurrently; the shared connector bounds parallelism
+    tasks = [data_collector.analyze_location(loc.latitude, loc.longitude) for loc in valid_locations]
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
     results = []
-    for loc in locations:
-        if not (23.0 <= loc.latitude <= 37.0 and 60.0 <= loc.longitude <= 77.0):
+    weather_rows = []
+    for loc, outcome in zip(valid_locations, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error processing location {loc.latitude}, {loc.longitude}: {outcome}")
             continue
-            
-        try:
-            weather = await data_collector.fetch_weather_data(loc.latitude, loc.longitude)
-            if weather:
-                soil = data_collector.get_soil_data(loc.latitude, loc.longitude)
-                recommendations = data_collector.get_crop_recommendations(loc.latitude, loc.longitude, weather, soil)
-                
-                results.append({
-                    "location": {"latitude": loc.latitude, "longitude": loc.longitude},
-                    "weather": weather,
-                    "soil": soil,
-                    "crop_recommendations": recommendations
-                })
-        except Exception as e:
-            logger.error(f"Error processing location {loc.latitude}, {loc.longitude}: {e}")
+        if outcome is None:
             continue
-    
+        result, weather_row = outcome
+        results.append(result)
+        weather_rows.append(weather_row)
+
+    # One transaction for the whole batch instead of one commit per location
+    await asyncio.to_thread(data_collector.save_weather_data, weather_rows)
+
     return {"results": results}
 
 @app.get("/api/v1/districts")
@@ -529,4 +680,6 @@ async def get_districts():
     return districts
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="localhost", port=8000)
\ No newline at end of file
+    # uvloop + httptools replace the default selector loop and h11 parser;
+    # the import-string form is required for multiple workers
+    uvicorn.run("api:app", host="localhost", port=8000, loop="uvloop", http="httptools", workers=4)
\ No newline at end of file